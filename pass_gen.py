@@ -14,13 +14,26 @@ Options:
 """
 
 import argparse
+import functools
+import os
 import secrets
+import shutil
 import string
 import sys
-import re
 from pathlib import Path
 import urllib.request
 
+try:
+    import numpy as np
+except ImportError:  # optional, only used for large --count batches
+    np = None
+
+
+_RNG = secrets.SystemRandom()
+
+# Only bother setting up the NumPy bulk path when the batch is big enough
+# to amortize the array conversion.
+BULK_THRESHOLD = 1000
 
 DEFAULT_SEP_SET = "!@#$%^&*_-+=:.?/"
 DEFAULT_WORDLIST_CANDIDATES = [
@@ -31,6 +44,9 @@ DEFAULT_WORDLIST_CANDIDATES = [
 EFF_LONG_URL = "https://www.eff.org/files/2016/07/18/eff_large_wordlist.txt"
 DEFAULT_EFF_FILENAME = "eff_large_wordlist.txt"
 
+DEFAULT_MIN_LEN = 4
+DEFAULT_MAX_LEN = 10
+
 
 FALLBACK_WORDS = """
 orbit slate lantern harbor cactus wagon ethics copper bundle quiet ribbon falcon magnet
@@ -48,20 +64,60 @@ def eprint(*a):
     print(*a, file=sys.stderr)
 
 
-def valid_word(w, min_len, max_len):
-    return min_len <= len(w) <= max_len and re.fullmatch(r"[a-z]+", w)
+def make_validator(min_len, max_len):
+    # Bind the length bounds once; the returned predicate reads them from
+    # its closure instead of taking them as arguments on every word.
+    def ok(w):
+        return min_len <= len(w) <= max_len and w.isascii() and w.islower() and w.isalpha()
+    return ok
+
+
+# Pre-filter the fallback list for the default length bounds so the common
+# invocation doesn't rescan a constant.
+_FALLBACK_DEFAULT = tuple(
+    filter(make_validator(DEFAULT_MIN_LEN, DEFAULT_MAX_LEN), FALLBACK_WORDS)
+)
+
+
+def cache_path(source, min_len, max_len):
+    # Keyed on the source mtime so edits to the dictionary invalidate the
+    # cache automatically.
+    base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "pass_gen"
+    mtime = os.stat(source).st_mtime_ns
+    return base / f"words-{Path(source).name}-{mtime}-{min_len}-{max_len}.txt"
 
 
 def load_words(path, min_len, max_len):
-    out = []
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            w = line.strip().lower()
-            if valid_word(w, min_len, max_len):
-                out.append(w)
-    return list(dict.fromkeys(out))
+    # A system dictionary is hundreds of thousands of lines but the filtered
+    # result is small; cache it so repeat invocations skip the parse.
+    try:
+        cache = cache_path(path, min_len, max_len)
+        if cache.exists():
+            return cache.read_text().split("\n")
+    except OSError:
+        cache = None
+
+    # Read the whole file as bytes and filter before decoding: bytes.isalpha
+    # only matches ASCII letters, so the check doubles as the charset filter
+    # and only the surviving words pay for a decode. Accumulating straight
+    # into a dict dedups as we go, so no second pass or duplicate list.
+    uniq = {}
+    for raw in Path(path).read_bytes().splitlines():
+        w = raw.strip().lower()
+        if min_len <= len(w) <= max_len and w.isalpha():
+            uniq[w.decode("ascii")] = None
+    words = list(uniq)
+
+    if cache is not None and words:
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            cache.write_text("\n".join(words))
+        except OSError:
+            pass
+    return words
 
 
+@functools.lru_cache(maxsize=1)
 def find_default_wordlist():
     for p in DEFAULT_WORDLIST_CANDIDATES:
         if Path(p).exists():
@@ -69,29 +125,35 @@ def find_default_wordlist():
     return None
 
 
+# In-memory layer over the on-disk cache: a long-lived process importing
+# this module pays the load once per (path, bounds) combination.
+@functools.lru_cache(maxsize=8)
+def _load_cached(path, min_len, max_len):
+    return tuple(load_words(path, min_len, max_len))
+
+
 def download_eff(dest):
     eprint("Downloading EFF wordlist…")
-    data = urllib.request.urlopen(EFF_LONG_URL).read()
-    dest.write_bytes(data)
+    with urllib.request.urlopen(EFF_LONG_URL, timeout=30) as resp, dest.open("wb") as fh:
+        shutil.copyfileobj(resp, fh, length=64 * 1024)
     eprint("Done.")
 
 
 def parse_eff(path, min_len, max_len):
-    words = []
-    with open(path, "r") as f:
-        for line in f:
-            parts = line.split()
-            if len(parts) >= 2:
-                w = parts[1].lower()
-                if valid_word(w, min_len, max_len):
-                    words.append(w)
-    return list(dict.fromkeys(words))
-
-
-def random_sep(sep, sep_set):
+    uniq = {}
+    for line in Path(path).read_bytes().splitlines():
+        parts = line.split()
+        if len(parts) >= 2:
+            w = parts[1].lower()
+            if min_len <= len(w) <= max_len and w.isalpha():
+                uniq[w.decode("ascii")] = None
+    return list(uniq)
+
+
+def random_sep(sep, sep_pool):
     if sep:
         return sep
-    return secrets.choice(list(sep_set))
+    return _RNG.choice(sep_pool)
 
 
 def apply_word_caps(words):
@@ -101,28 +163,99 @@ def apply_word_caps(words):
     count = secrets.randbelow(n) + 1
 
     # Select unique indices securely
-    idxs = set()
-    while len(idxs) < count:
-        idxs.add(secrets.randbelow(n))
-
-    for i in idxs:
+    for i in _RNG.sample(range(n), count):
         words[i] = words[i].upper()
 
     return words
 
 
+# Uppercase map for all 256 byte values; identity outside a-z, so lookups
+# need no alpha test at all.
+_TO_UPPER = bytes(c - 32 if 97 <= c <= 122 else c for c in range(256))
+
+
 def apply_char_caps(s):
+    # One bulk entropy draw; the low two bits of each byte give the same
+    # 1-in-4 chance as the old per-char randbelow(4) call.
+    rand = secrets.token_bytes(len(s))
+    if s.isascii():
+        # Mutate the ASCII bytes in place; _TO_UPPER leaves everything but
+        # a-z alone, so the mask test is the only branch per character.
+        b = bytearray(s, "ascii")
+        for i, r in enumerate(rand):
+            if r & 3 == 0:
+                b[i] = _TO_UPPER[b[i]]
+        return b.decode("ascii")
+    # Non-ASCII separators fall back to the str path.
     out = []
-    for c in s:
-        if c.isalpha() and secrets.randbelow(4) == 0:
+    for c, r in zip(s, rand):
+        if c.isalpha() and r & 3 == 0:
             out.append(c.upper())
         else:
             out.append(c)
     return "".join(out)
 
 
+def batch_choice(seq, k):
+    """Pick k items with replacement from one bulk urandom read.
+
+    Lemire multiply-shift reduction: for a 32-bit draw x, (x * n) >> 32 is
+    uniform over range(n) once draws whose low product bits fall under the
+    2**32 % n threshold are rejected.
+    """
+    n = len(seq)
+    t = (1 << 32) % n
+    out = []
+    while len(out) < k:
+        raw = os.urandom(4 * (k - len(out) + 2))
+        for i in range(0, len(raw), 4):
+            m = int.from_bytes(raw[i:i + 4], "little") * n
+            if (m & 0xFFFFFFFF) >= t:
+                out.append(seq[m >> 32])
+                if len(out) == k:
+                    break
+    return out
+
+
+def generate_passphrase(words, n_words, separator, word_caps=False, chosen=None):
+    if chosen is None:
+        chosen = batch_choice(words, n_words)
+    if word_caps:
+        return separator.join(apply_word_caps(list(chosen)))
+    # Common path: feed the drawn batch straight to join, no intermediate
+    # handling of the word list.
+    return separator.join(chosen)
+
+
+def bulk_word_rows(words, count, n_words):
+    """Draw all count*n_words words with one urandom call per refill.
+
+    Uses NumPy to index the wordlist in C. Raw 32-bit values above the
+    largest multiple of len(words) are rejected so the modulo reduction
+    stays unbiased.
+    """
+    n = len(words)
+    need = count * n_words
+    limit = (1 << 32) - ((1 << 32) % n)
+    idx = np.empty(need, dtype=np.intp)
+    got = 0
+    while got < need:
+        raw = np.frombuffer(os.urandom(4 * (need - got + 16)), dtype=np.uint32)
+        ok = raw[raw < limit][: need - got]
+        idx[got:got + ok.size] = ok % n
+        got += ok.size
+    return np.array(words)[idx].reshape(count, n_words)
+
+
 def inject_digit(s):
-    pos = secrets.randbelow(len(s) + 1)
+    # One entropy read covers both draws. The position modulo on a 32-bit
+    # value is biased by < 2**-26 for these string lengths; the digit byte
+    # is rejection-sampled below 250 so its % 10 is exactly uniform.
+    raw = os.urandom(8)
+    pos = int.from_bytes(raw[:4], "little") % (len(s) + 1)
+    for b in raw[4:]:
+        if b < 250:
+            return s[:pos] + string.digits[b % 10] + s[pos:]
     return s[:pos] + secrets.choice(string.digits) + s[pos:]
 
 
@@ -134,15 +267,15 @@ def main():
     ap.add_argument("--sep-set", default=DEFAULT_SEP_SET)
     ap.add_argument("--wordlist", default=None)
     ap.add_argument("--download-eff", action="store_true")
-    ap.add_argument("--min-len", type=int, default=4)
-    ap.add_argument("--max-len", type=int, default=10)
+    ap.add_argument("--min-len", type=int, default=DEFAULT_MIN_LEN)
+    ap.add_argument("--max-len", type=int, default=DEFAULT_MAX_LEN)
     ap.add_argument("--nums", action="store_true")
     ap.add_argument("--rand_caps", choices=["word", "char"])
 
     args = ap.parse_args()
 
     if args.wordlist:
-        words = load_words(args.wordlist, args.min_len, args.max_len)
+        words = _load_cached(args.wordlist, args.min_len, args.max_len)
     elif args.download_eff:
         p = Path(DEFAULT_EFF_FILENAME)
         if not p.exists():
@@ -151,21 +284,26 @@ def main():
     else:
         p = find_default_wordlist()
         if p:
-            words = load_words(p, args.min_len, args.max_len)
+            words = _load_cached(p, args.min_len, args.max_len)
+        elif (args.min_len, args.max_len) == (DEFAULT_MIN_LEN, DEFAULT_MAX_LEN):
+            words = _FALLBACK_DEFAULT
         else:
-            words = [w for w in FALLBACK_WORDS if valid_word(w, args.min_len, args.max_len)]
+            words = list(filter(make_validator(args.min_len, args.max_len), FALLBACK_WORDS))
 
     if len(words) < 500:
         eprint(f"Warning: wordlist only {len(words)} words")
 
-    for _ in range(args.count):
-        sep = random_sep(args.sep, args.sep_set)
-        chosen = [secrets.choice(words) for _ in range(args.words)]
+    sep_pool = tuple(args.sep_set)
 
-        if args.rand_caps == "word":
-            chosen = apply_word_caps(chosen)
+    rows = None
+    if np is not None and args.count * args.words >= BULK_THRESHOLD:
+        rows = bulk_word_rows(words, args.count, args.words)
 
-        s = sep.join(chosen)
+    for i in range(args.count):
+        sep = random_sep(args.sep, sep_pool)
+        s = generate_passphrase(words, args.words, sep,
+                                word_caps=args.rand_caps == "word",
+                                chosen=None if rows is None else rows[i])
 
         if args.rand_caps == "char":
             s = apply_char_caps(s)